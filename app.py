@@ -1,13 +1,16 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime as dt
+import re
 import time
+import functools
 from typing import List, Dict, Tuple, Optional
 
 from google_auth_oauthlib.flow import Flow
 import gspread
-from gspread_formatting import format_cell_range, CellFormat, Color, TextFormat
+from gspread_formatting import batch_updater, CellFormat, Color, TextFormat
 
 st.set_page_config(page_title="MWA Points Tracker — Live Preview", layout="wide")
 st.caption(f"Optimized build @ {int(time.time())}")
@@ -28,70 +31,75 @@ CATEGORIES = [
     "Cardiac (Subspecialty) - Coverage",
 ]
 AR_BASE = 20.0  # points/hour baseline for Assigned & Activation
+ENTRY_COLUMNS = [
+    "Date","Holiday","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes"
+]
+DAILY_TOTAL_COLUMNS = ["Date","Holiday","Time Points","Productivity Points","Extra Points","TEE Points","Total Points"]
+
+def col_letter(n: int) -> str:
+    """1-based column number -> A1 letter (headers here never exceed Z)"""
+    return chr(64 + n)
 
-def fmt_hhmm(t: Optional[dt.time]) -> str:
-    return t.strftime("%H:%M") if isinstance(t, dt.time) else ""
+# "HH:MM" for every minute of the day; the trailing "" is what index -1 (missing time) picks up
+HHMM_TABLE = np.array([f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)] + [""], dtype=object)
 
+_TIME_RE = re.compile(r"^([0-9:]+)(am|pm)?$")
+
+@functools.lru_cache(maxsize=256)
 def parse_time_any(txt: str) -> Optional[dt.time]:
     """Parse '730', '7:30', '715am', '5pm', '19:05' -> datetime.time or None"""
-    txt = (txt or "").strip().lower().replace(" ", "")
-    if not txt:
-        return None
-    
-    # Check for AM/PM
-    ampm = None
-    if txt.endswith("am"):
-        ampm = "am"
-        txt = txt[:-2]
-    elif txt.endswith("pm"):
-        ampm = "pm"
-        txt = txt[:-2]
-    
-    # Remove colons
-    txt = txt.replace(":", "")
-    
-    # Must be digits only at this point
-    if not txt.isdigit():
+    m = _TIME_RE.match((txt or "").strip().lower().replace(" ", ""))
+    if not m:
         return None
-    
-    # Parse based on length
-    if len(txt) == 1:
-        # Single digit: treat as hour (e.g., "5" -> 5:00)
-        hh, mm = int(txt), 0
-    elif len(txt) == 2:
-        # Two digits: could be "05" (5:00) or "30" (0:30)
-        # Treat as hours if <= 23, otherwise invalid
-        val = int(txt)
-        if val <= 23:
-            hh, mm = val, 0
-        else:
-            return None
-    elif len(txt) == 3:
-        # Three digits: "730" -> 7:30, "030" -> 0:30
-        hh, mm = int(txt[0]), int(txt[1:])
-    elif len(txt) == 4:
-        # Four digits: "0730" -> 7:30, "2359" -> 23:59, "0000" -> 0:00
-        hh, mm = int(txt[:2]), int(txt[2:])
-    else:
+    digits = m.group(1).replace(":", "")
+    n = len(digits)
+    if not 1 <= n <= 4:
         return None
-    
+
+    # 1-2 digits are an hour ("5", "17"); 3-4 digits are HMM/HHMM ("730", "2359")
+    val = int(digits)
+    hh, mm = divmod(val, 100) if n >= 3 else (val, 0)
+
     # Apply AM/PM conversion
+    ampm = m.group(2)
     if ampm == "am":
         if hh == 12:
             hh = 0
     elif ampm == "pm":
         if hh < 12:
             hh += 12
-    
+
     # Validate ranges
-    if not (0 <= hh <= 23 and 0 <= mm <= 59):
+    if not (hh <= 23 and mm <= 59):
         return None
-    
+
     return dt.time(hh, mm)
 
 def to_minutes(t: dt.time) -> int:
     return t.hour*60 + t.minute
 
+def _time_col_minutes(col: pd.Series) -> np.ndarray:
+    """Minute-of-day for a column of dt.time values, -1 where missing"""
+    return np.fromiter((to_minutes(t) if isinstance(t, dt.time) else -1 for t in col), dtype=np.int64, count=len(col))
+
+def _date_labels(dates: pd.Series, fmt: str) -> pd.Series:
+    """strftime per row (NaN where missing), formatting each distinct date once"""
+    labels = {d: d.strftime(fmt) for d in dates.dropna().unique()}
+    return dates.map(labels)
+
+def month_labels(dates: pd.Series) -> pd.Series:
+    """"Mon YYYY" tab name per row (NaN where missing)"""
+    return _date_labels(dates, "%b %Y")
+
+def _weekend_mask(dates: pd.Series) -> np.ndarray:
+    """Saturday/Sunday flags for a column of dates via ordinals (ordinal 1 is a Monday); missing -> False"""
+    ords = np.fromiter((d.toordinal() if pd.notna(d) else 0 for d in dates), dtype=np.int64, count=len(dates))
+    return (ords > 0) & ((ords - 1) % 7 >= 5)
+
+def fmt_hhmm_col(col: pd.Series) -> List[str]:
+    """"HH:MM" for a column of dt.time values ("" where missing) via one table lookup"""
+    return HHMM_TABLE[_time_col_minutes(col)].tolist()
+
 def minutes_to_time(m: int) -> dt.time:
     m = max(0, min(1439, int(m)))
     return dt.time(m//60, m%60)
@@ -113,15 +121,30 @@ def _minute_multiplier(minute_of_day: int, weekend_or_holiday: bool) -> float:
     m = minute_band(minute_of_day)
     return 1.00 if m == "1.00x" else (1.10 if m == "1.10x" else 1.25)
 
-def _minute_rate_pts(category: str, m: int, wknd_hol: bool) -> float:
-    mult = _minute_multiplier(m, wknd_hol)
-    if category in ("Assigned (General AR)", "Activation from Unrestricted Call"):
-        return AR_BASE * mult
-    if category == "Restricted OB (In-house)":
-        return 13.0 * mult
-    if category == "Unrestricted Call":
-        return 3.5  # flat
-    return 0.0  # Cardiac is an adder at day level
+# Per-minute lookup tables indexed [weekend_or_holiday][minute_of_day]; no branching in the hot loops
+_MINUTE_MULTS = tuple(tuple(_minute_multiplier(m, w) for m in range(1440)) for w in (False, True))
+_MINUTE_BANDS = (
+    tuple(minute_band(m) for m in range(1440)),
+    tuple("1.10x" if 7 <= m/60.0 < 17 else "1.25x" for m in range(1440)),
+)
+
+# Integer category codes (index into CATEGORIES) so the per-minute loops compare ints, not strings
+CATEGORY_CODE = {name: i for i, name in enumerate(CATEGORIES)}
+_ASSIGNED_CODE = CATEGORY_CODE["Assigned (General AR)"]
+_CARDIAC_CODE = CATEGORY_CODE["Cardiac (Subspecialty) - Coverage"]
+
+# Banded base rates (points/hour before the multiplier); Cardiac is an adder at day level
+_CATEGORY_BASE_RATE = {
+    "Assigned (General AR)": AR_BASE,
+    "Activation from Unrestricted Call": AR_BASE,
+    "Restricted OB (In-house)": 13.0,
+}
+_FLAT_RATE_CATEGORY = "Unrestricted Call"  # 3.5 pts/hour regardless of band
+
+# Per-minute rate for every (code, weekday/weekend-or-holiday, minute): base * multiplier + flat
+_BASE_BY_CODE = np.array([_CATEGORY_BASE_RATE.get(name, 0.0) for name in CATEGORIES])
+_FLAT_BY_CODE = np.array([3.5 if name == _FLAT_RATE_CATEGORY else 0.0 for name in CATEGORIES])
+_MINUTE_RATE_TABLE = _BASE_BY_CODE[:, None, None] * np.array(_MINUTE_MULTS) + _FLAT_BY_CODE[:, None, None]
 
 def _split_across_midnights(start_dt: dt.datetime, end_dt: dt.datetime):
     """
@@ -151,68 +174,86 @@ def _split_across_midnights(start_dt: dt.datetime, end_dt: dt.datetime):
     if to_minutes(end_dt.time()) > 0:
         yield (end_dt.date(), 0, to_minutes(end_dt.time()))
 
-def compute_day_time_points(date_obj: dt.date, df_entries: pd.DataFrame):
-    # Dominance per minute for a single date.
-    # Returns: total_time_points, per_category_minutes, assigned_min_applied, band_points
-    if df_entries is None or df_entries.empty:
-        return 0.0, {}, False, {"1.00x":0.0, "1.10x":0.0, "1.25x":0.0}
-
-    wknd = date_obj.weekday() >= 5
-    is_holiday = bool(df_entries.get("Holiday", pd.Series([False])).astype(bool).any())
-    wknd_hol = wknd or is_holiday
+_BAND_LABELS = ("1.00x", "1.10x", "1.25x")
+_MINUTE_BAND_IDX = np.array([[_BAND_LABELS.index(b) for b in bands] for bands in _MINUTE_BANDS])
 
-    minutes_winner = [-1.0] * 1440
-    winner_cat = [None] * 1440
+def _seq_sum(a: np.ndarray) -> float:
+    # Left-to-right running sum, so totals match accumulating minute by minute
+    return float(np.cumsum(a)[-1]) if a.size else 0.0
 
-    for _, r in df_entries.iterrows():
-        cat = str(r.get("Category", ""))
-        if cat == "Cardiac (Subspecialty) - Coverage":
-            continue
-        stime = r.get("Start"); etime = r.get("End")
-        if not (isinstance(stime, dt.time) and isinstance(etime, dt.time)):
-            continue
-        smin = to_minutes(stime); emin = to_minutes(etime)
-        if emin <= smin:
-            continue
-        for m in range(smin, emin):
-            rate = _minute_rate_pts(cat, m, wknd_hol)
-            if rate > minutes_winner[m]:
-                minutes_winner[m] = rate
-                winner_cat[m] = cat
-
-    per_cat_minutes = {}
-    band_points = {"1.00x":0.0, "1.10x":0.0, "1.25x":0.0}
+@functools.lru_cache(maxsize=4096)
+def _day_time_points_core(wknd_hol: bool, intervals: Tuple[Tuple[int, int, int], ...], has_cardiac: bool):
+    # Pure dominance solver on (category_code, start_min, end_min) tuples; identical days hit the cache.
+    # Returns: total_time_points, per_category_minutes, assigned_min_applied, band_points (as tuples)
+    minutes_by_code = [0] * len(CATEGORIES)
+    band_points = {label: 0.0 for label in _BAND_LABELS}
     total_pts = 0.0
     assigned_pts = 0.0
 
-    for m, cat in enumerate(winner_cat):
-        if cat is None:
-            continue
-        per_cat_minutes[cat] = per_cat_minutes.get(cat, 0) + 1
-        pts_min = _minute_rate_pts(cat, m, wknd_hol) / 60.0
-        total_pts += pts_min
-        if wknd_hol:
-            band = "1.10x" if 7 <= m/60.0 < 17 else "1.25x"
-        else:
-            band = minute_band(m)
-        if cat in ("Assigned (General AR)", "Activation from Unrestricted Call", "Restricted OB (In-house)", "Unrestricted Call"):
-            band_points[band] += pts_min
-        if cat == "Assigned (General AR)":
-            assigned_pts += pts_min
+    if intervals:
+        # Running winner per minute, updated in place per interval; strict '>' keeps the first on ties
+        winner_rate = np.full(1440, -1.0)
+        winner_code = np.full(1440, -1, dtype=np.int64)
+        rate_rows = _MINUTE_RATE_TABLE[:, int(wknd_hol)]
+        for code, smin, emin in intervals:
+            seg = rate_rows[code, smin:emin]
+            better = seg > winner_rate[smin:emin]
+            winner_rate[smin:emin][better] = seg[better]
+            winner_code[smin:emin][better] = code
+        won = winner_code >= 0
+        win_code = winner_code[won]
+        pts = winner_rate[won] / 60.0
+        band_idx = _MINUTE_BAND_IDX[int(wknd_hol)][won]
+
+        # Every code reaching here is a timed category, so each won minute counts toward its band
+        minutes_by_code = np.bincount(win_code, minlength=len(CATEGORIES)).tolist()
+        total_pts = _seq_sum(pts)
+        for i, label in enumerate(_BAND_LABELS):
+            band_points[label] = _seq_sum(pts[band_idx == i])
+        assigned_pts = _seq_sum(pts[win_code == _ASSIGNED_CODE])
 
     assigned_min_applied = False
-    if per_cat_minutes.get("Assigned (General AR)", 0) > 0 and assigned_pts < 80.0:
+    if minutes_by_code[_ASSIGNED_CODE] > 0 and assigned_pts < 80.0:
         total_pts += (80.0 - assigned_pts)
         assigned_min_applied = True
         band_points["1.00x"] += max(0.0, 80.0 - assigned_pts)
 
-    if (df_entries["Category"] == "Cardiac (Subspecialty) - Coverage").any():
+    if has_cardiac:
         total_pts += 45.0  # daily adder
 
     for k in list(band_points.keys()):
         band_points[k] = round(float(band_points[k]), 2)
 
-    return round(total_pts, 2), per_cat_minutes, assigned_min_applied, band_points
+    per_cat_minutes = tuple((CATEGORIES[code], n) for code, n in enumerate(minutes_by_code) if n)
+    return round(total_pts, 2), per_cat_minutes, assigned_min_applied, tuple(band_points.items())
+
+def _interval_columns(df_entries: pd.DataFrame) -> Tuple[List[int], List[int], List[int]]:
+    """Category codes (-1 unknown) and start/end minutes (-1 missing) as plain lists"""
+    codes = df_entries["Category"].map(CATEGORY_CODE).fillna(-1).astype(int).tolist()
+    return codes, _time_col_minutes(df_entries["Start"]).tolist(), _time_col_minutes(df_entries["End"]).tolist()
+
+def _day_from_columns(wknd_hol: bool, codes: List[int], smins: List[int], emins: List[int]):
+    # Column-wise (category_code, start_min, end_min); Cardiac and unknown categories carry no time points
+    intervals = tuple(
+        (code, smin, emin)
+        for code, smin, emin in zip(codes, smins, emins)
+        if code >= 0 and code != _CARDIAC_CODE and smin >= 0 and emin > smin
+    )
+    return _day_time_points_core(wknd_hol, intervals, _CARDIAC_CODE in codes)
+
+def compute_day_time_points(date_obj: dt.date, df_entries: pd.DataFrame):
+    # Dominance per minute for a single date.
+    # Returns: total_time_points, per_category_minutes, assigned_min_applied, band_points
+    if df_entries is None or df_entries.empty:
+        return 0.0, {}, False, {"1.00x":0.0, "1.10x":0.0, "1.25x":0.0}
+
+    wknd = date_obj.weekday() >= 5
+    is_holiday = bool(df_entries["Holiday"].any())
+    wknd_hol = wknd or is_holiday
+
+    codes, smins, emins = _interval_columns(df_entries)
+    total_pts, per_cat_minutes, assigned_min_applied, band_points = _day_from_columns(wknd_hol, codes, smins, emins)
+    return total_pts, dict(per_cat_minutes), assigned_min_applied, dict(band_points)
 
 def get_auth_flow(state: str):
     client_config = {
@@ -242,9 +283,66 @@ def exchange_code_for_token():
         code = params["code"]
         flow = get_auth_flow(state)
         flow.fetch_token(code=code)
+        # Codes are single-use; drop them from the URL so a reload doesn't retry the exchange
+        st.query_params.clear()
         return flow.credentials
     return None
 
+def _coerce_entry_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Guarantee entry dtypes once so downstream code can use values without defensive casts"""
+    df["Holiday"] = df["Holiday"].fillna(False).astype(bool)
+    df["TEE Exams"] = pd.to_numeric(df["TEE Exams"], errors="coerce").fillna(0).astype("int64")
+    for col in ["Productivity Points", "Extra Points"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype("float64")
+    for col in ["Category", "Notes"]:
+        df[col] = df[col].fillna("").astype(str)
+    return df
+
+def _parse_entries(values: List[List[str]]) -> pd.DataFrame:
+    """Build the entries DataFrame from raw sheet values (header row first)"""
+    if not values or len(values) < 2:
+        return _coerce_entry_dtypes(pd.DataFrame(columns=ENTRY_COLUMNS))
+
+    df = pd.DataFrame(values[1:], columns=values[0]).reindex(columns=ENTRY_COLUMNS)
+    
+    # Parse dates (explicit ISO format skips inference; hand-edited cells fall back)
+    raw_dates = df["Date"].fillna("").astype(str).str.strip()
+    dates = pd.to_datetime(raw_dates, format="%Y-%m-%d", errors="coerce", cache=True)
+    fallback = dates.isna() & (raw_dates != "")
+    if fallback.any():
+        dates[fallback] = pd.to_datetime(raw_dates[fallback], format="mixed", errors="coerce", cache=True)
+    df["Date"] = dates.dt.date
+    
+    # Parse times (vectorized for the stored HH:MM format)
+    for col in ["Start", "End"]:
+        raw = df[col].fillna("").astype(str).str.strip()
+        parsed = pd.to_datetime(raw, format="%H:%M", errors="coerce", cache=True)
+        times = parsed.dt.time.astype(object).where(parsed.notna(), None)
+        # Fall back to the lenient parser only for hand-typed values like "7:30am"
+        fallback = parsed.isna() & (raw != "")
+        if fallback.any():
+            times[fallback] = raw[fallback].map(parse_time_any)
+        df[col] = times
+    
+    # Raw values come back as "TRUE"/"FALSE" strings
+    df["Holiday"] = df["Holiday"].fillna("").astype(str).str.strip().str.upper() == "TRUE"
+    
+    return _coerce_entry_dtypes(df)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_entries(spreadsheet_id: str, revision: int, _values: List[List[str]]) -> pd.DataFrame:
+    """Parse sheet values once per (spreadsheet, revision); reruns get the cached frame"""
+    return _parse_entries(_values)
+
+def fetch_entry_values(ws_entries) -> List[List[str]]:
+    """Raw Entries values (header row first) limited to the ENTRY_COLUMNS block"""
+    return ws_entries.get_values(f"A:{col_letter(len(ENTRY_COLUMNS))}")
+
+def set_sheet_data(values: List[List[str]]):
+    """Store fetched/written sheet values and bump the revision that keys the parse cache"""
+    st.session_state["sheet_data"] = values
+    st.session_state["entries_rev"] = time.time_ns()
+
 def load_entries(ws_entries) -> pd.DataFrame:
     """Load entries with caching to reduce API calls"""
     
@@ -258,7 +356,8 @@ def load_entries(ws_entries) -> pd.DataFrame:
     if col1.button("🔄 Refresh Data"):
         try:
             with st.spinner("Loading from Google Sheets..."):
-                st.session_state["sheet_data"] = ws_entries.get_all_records()
+                # Raw values (one request, no per-row dict building like get_all_records)
+                set_sheet_data(fetch_entry_values(ws_entries))
                 st.session_state["last_refresh"] = dt.datetime.now()
             st.success("Data refreshed!")
         except Exception as e:
@@ -273,61 +372,32 @@ def load_entries(ws_entries) -> pd.DataFrame:
     # If no data loaded yet, show info message
     if st.session_state["sheet_data"] is None:
         st.info("👆 Press 'Refresh Data' to load your entries from Google Sheets.")
-        return pd.DataFrame(columns=[
-            "Date","Holiday","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes"
-        ])
-    
-    values = st.session_state["sheet_data"]
-    if not values:
-        return pd.DataFrame(columns=[
-            "Date","Holiday","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes"
-        ])
-    
-    df = pd.DataFrame(values)
-    
-    # Parse dates
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-    
-    # Parse times
-    for col in ["Start", "End"]:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: parse_time_any(str(x)) if pd.notna(x) else None)
-    
-    # Parse numeric columns
-    for col in ["TEE Exams", "Productivity Points", "Extra Points"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-    
-    # Handle boolean
-    if "Holiday" in df.columns:
-        df["Holiday"] = df["Holiday"].astype(bool)
-    
-    # Handle text columns
-    for col in ["Category", "Notes"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("")
+        return _coerce_entry_dtypes(pd.DataFrame(columns=ENTRY_COLUMNS))
     
-    return df
+    return _cached_entries(ws_entries.spreadsheet_id, st.session_state["entries_rev"], st.session_state["sheet_data"])
 
-def ensure_user_sheet(gc):
+def ensure_user_sheet(gc, sheet_id: Optional[str] = None):
     SPREADSHEET_NAME = "MWA Points Tracker"
     
-    # Open or create spreadsheet
-    try:
-        sh = gc.open(SPREADSHEET_NAME)
-    except Exception:
-        sh = gc.create(SPREADSHEET_NAME)
-
-    def get_or_create(name: str, header: Optional[List[str]] = None, rows=4000, cols=20):
-        """Get existing worksheet or create new one"""
-        ws = None
-        
-        # Try to get existing worksheet
+    # Open by key when we already know it (skips the Drive title search), else by name or create
+    sh = None
+    if sheet_id:
+        try:
+            sh = gc.open_by_key(sheet_id)
+        except Exception:
+            pass  # Deleted or no longer shared; fall back to the title lookup
+    if sh is None:
         try:
-            ws = sh.worksheet(name)
+            sh = gc.open(SPREADSHEET_NAME)
         except Exception:
-            pass  # Worksheet doesn't exist
+            sh = gc.create(SPREADSHEET_NAME)
+
+    # One metadata fetch lists every tab; look them up by title instead of one call per tab
+    existing = {ws.title: ws for ws in sh.worksheets()}
+
+    def get_or_create(name: str, rows=4000, cols=20):
+        """Get existing worksheet or create new one"""
+        ws = existing.get(name)
         
         # If worksheet doesn't exist, create it
         if ws is None:
@@ -343,173 +413,227 @@ def ensure_user_sheet(gc):
                 else:
                     raise
         
-        # Ensure headers are present (only if we have header to set)
-        if ws and header:
-            try:
-                vals = ws.get_all_values()
-                # If sheet is empty or first row is empty, add headers
-                if not vals or not vals[0] or all(not cell for cell in vals[0]):
-                    end_col = chr(64 + len(header))
-                    ws.update(f"A1:{end_col}1", [header])
-            except Exception:
-                # If we can't read/write headers, continue anyway
-                pass
-        
         return ws
 
-    ws_entries = get_or_create("Entries", header=[
-        "Date","Holiday","Category","Start","End",
-        "TEE Exams","Productivity Points","Extra Points","Notes"
-    ])
-    ws_daily = get_or_create("Daily Totals", header=[
-        "Date","Holiday","Time Points","Productivity Points","Extra Points","TEE Points","Total Points"
-    ], rows=2000, cols=10)
-    ws_msum = get_or_create("Monthly Summary", header=["Month","Total Points"], rows=300, cols=3)
+    ws_entries = get_or_create("Entries")
+    ws_daily = get_or_create("Daily Totals", rows=2000, cols=10)
+    ws_msum = get_or_create("Monthly Summary", rows=300, cols=3)
+
+    # Ensure headers are present, checking every tab's first row in one batched read
+    headers = [
+        (ws_entries, ENTRY_COLUMNS),
+        (ws_daily, DAILY_TOTAL_COLUMNS),
+        (ws_msum, ["Month","Total Points"]),
+    ]
+    try:
+        # Bounded to each header's width so only the cells we compare come back
+        resp = sh.values_batch_get([f"'{ws.title}'!A1:{col_letter(len(header))}1" for ws, header in headers])
+        missing = []
+        for (ws, header), value_range in zip(headers, resp.get("valueRanges", [])):
+            first_row = (value_range.get("values") or [[]])[0]
+            # If sheet is empty or first row is empty, add headers
+            if all(not cell for cell in first_row):
+                missing.append({"range": f"'{ws.title}'!A1:{col_letter(len(header))}1", "values": [header]})
+        # Seed every missing header in one request
+        if missing:
+            sh.values_batch_update({"valueInputOption": "RAW", "data": missing})
+    except Exception:
+        # If we can't read/write headers, continue anyway
+        pass
     
     return sh, ws_entries, ws_daily, ws_msum
 
+# Bounded: access tokens rotate about hourly, so old keys would otherwise pin clients and credentials forever
+@st.cache_resource(show_spinner=False, ttl=3600, max_entries=100)
+def get_user_sheets(token: str, _creds, _sheet_id: Optional[str] = None):
+    """Authorize and open the user's sheet once per token; reruns reuse the cached handles"""
+    gc = gspread.authorize(_creds)
+    return ensure_user_sheet(gc, _sheet_id)
+
+def _entry_rows(df: pd.DataFrame) -> List[list]:
+    """Format entries as sheet rows in ENTRY_COLUMNS order"""
+    # Format the object columns once, then zip plain Python values column-wise
+    dates = _date_labels(df["Date"], "%Y-%m-%d").fillna("")
+    return [list(row) for row in zip(
+        dates.tolist(),
+        df["Holiday"].tolist(),
+        df["Category"].tolist(),
+        fmt_hhmm_col(df["Start"]),
+        fmt_hhmm_col(df["End"]),
+        df["TEE Exams"].tolist(),
+        df["Productivity Points"].tolist(),
+        df["Extra Points"].tolist(),
+        df["Notes"].tolist(),
+    )]
+
 def save_entries(ws_entries, df: pd.DataFrame):
-    header = ["Date","Holiday","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes"]
+    """Full rewrite of the Entries tab; only needed when existing rows change"""
     ws_entries.clear()
-    ws_entries.update("A1:I1", [header])
+    # Header and body go up in a single write
+    out = [ENTRY_COLUMNS] + _entry_rows(df)
+    ws_entries.update(f"A1:I{len(out)}", out)
+
+def append_entries(ws_entries, df: pd.DataFrame, with_header: bool = False) -> List[list]:
+    """Append only the new rows to the Entries tab (led by the header when the tab is empty) and return what was written"""
     if df.empty:
-        return
-    out = []
-    for _, r in df.iterrows():
-        def fmt(t): return t.strftime("%H:%M") if isinstance(t, dt.time) else ""
-        out.append([
-            r["Date"].strftime("%Y-%m-%d") if isinstance(r["Date"], dt.date) else "",
-            bool(r.get("Holiday", False)),
-            r.get("Category",""),
-            fmt(r.get("Start")),
-            fmt(r.get("End")),
-            int(r.get("TEE Exams",0) or 0),
-            float(r.get("Productivity Points",0) or 0.0),
-            float(r.get("Extra Points",0) or 0.0),
-            r.get("Notes","")
-        ])
-    ws_entries.update(f"A2:I{len(out)+1}", out)
-
-def write_daily_totals(sh, df_entries: pd.DataFrame):
-    ws = sh.worksheet("Daily Totals")
-    ws.clear()
-    ws.update("A1:G1", [[
-        "Date","Holiday","Time Points","Productivity Points","Extra Points","TEE Points","Total Points"
-    ]])
-    if df_entries.empty:
-        return
-    dfe = df_entries.copy()
-    dfe["Date"] = pd.to_datetime(dfe["Date"]).dt.date
-    for col in ["TEE Exams","Productivity Points","Extra Points"]:
-        if col in dfe:
-            dfe[col] = pd.to_numeric(dfe[col], errors="coerce").fillna(0.0)
-        else:
-            dfe[col] = 0.0
-    out_rows = []
-    for d, chunk in dfe.groupby("Date"):
-        time_pts, _, _, _ = compute_day_time_points(d, chunk)
-        tee_pts = float(chunk["TEE Exams"].sum()) * 22.0
-        prod_pts = float(chunk["Productivity Points"].sum())
-        extra_pts = float(chunk["Extra Points"].sum())
-        total = time_pts + tee_pts + prod_pts + extra_pts
-        holiday_flag = bool(chunk.get("Holiday", pd.Series([False])).astype(bool).any())
-        out_rows.append([d.strftime("%Y-%m-%d"), holiday_flag, round(time_pts,2), round(prod_pts,2), round(extra_pts,2), round(tee_pts,2), round(total,2)])
-    if out_rows:
-        ws.update(f"A2:G{len(out_rows)+1}", out_rows)
-
-def month_tab_name(d: dt.date) -> str:
-    return d.strftime("%b %Y")
-
-def ensure_month_sheet(sh, name: str):
-    try:
-        ws = sh.worksheet(name)
-    except Exception:
-        ws = sh.add_worksheet(title=name, rows=1000, cols=12)
-        ws.update("A1:J1", [[
-            "Date","Holiday","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes","Entry Total Points"
-        ]])
-    return ws
-
-def _entry_time_points_basic(row, date_is_weekend_or_holiday: bool) -> float:
-    s = row["Start"]; e = row["End"]
-    if not (isinstance(s, dt.time) and isinstance(e, dt.time)):
-        return 0.0
-    smin = to_minutes(s); emin = to_minutes(e)
-    if emin <= smin:
-        return 0.0
-    pts = 0.0
-    for m in range(smin, emin):
-        pts += _minute_rate_pts(row["Category"], m, date_is_weekend_or_holiday) / 60.0
-    return round(pts, 2)
-
-def write_month_sheets(sh, df_entries: pd.DataFrame):
+        return []
+    out = ([ENTRY_COLUMNS] if with_header else []) + _entry_rows(df)
+    ws_entries.append_rows(out, value_input_option="RAW", insert_data_option="INSERT_ROWS")
+    return out
+
+def compute_daily_totals(df_entries: pd.DataFrame) -> pd.DataFrame:
+    """One row per date (sorted) with dominance time points, adders and the daily total"""
     if df_entries.empty:
-        return
-    dfe = df_entries.copy()
-    dfe["Entry Base Time Points"] = dfe.apply(
-        lambda r: _entry_time_points_basic(r, (r["Holiday"] or (r["Date"].weekday()>=5))), axis=1
+        return pd.DataFrame(columns=DAILY_TOTAL_COLUMNS)
+    by_date = df_entries.groupby("Date")
+    # Float adders go through Series.sum per date: groupby's built-in sum is compensated and can land
+    # on the other side of a half cent (TEE Exams are integers, so their sum is exact either way)
+    out = by_date.agg(**{
+        "Holiday": ("Holiday", "any"),
+        "Productivity Points": ("Productivity Points", lambda s: s.sum()),
+        "Extra Points": ("Extra Points", lambda s: s.sum()),
+        "TEE Exams": ("TEE Exams", "sum"),
+    })
+    # Dominance per date straight from whole-frame columns; no per-day sub-DataFrames
+    codes, smins, emins = _interval_columns(df_entries)
+    rows = by_date.indices
+    wknd_hol = _weekend_mask(out.index.to_series()) | out["Holiday"].to_numpy(dtype=bool)
+    out["Time Points"] = [
+        _day_from_columns(bool(wh), [codes[i] for i in rows[d]], [smins[i] for i in rows[d]], [emins[i] for i in rows[d]])[0]
+        for d, wh in zip(out.index, wknd_hol)
+    ]
+    out["TEE Points"] = out["TEE Exams"] * 22.0
+    out["Total Points"] = out["Time Points"] + out["TEE Points"] + out["Productivity Points"] + out["Extra Points"]
+    return out.reset_index()[DAILY_TOTAL_COLUMNS]
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_daily_totals(spreadsheet_id: str, revision: int, _df_entries: pd.DataFrame) -> pd.DataFrame:
+    """Daily totals for a parsed entries revision; shared by the preview and Summary tab"""
+    return compute_daily_totals(_df_entries)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_date_index(spreadsheet_id: str, revision: int, _df_entries: pd.DataFrame) -> Dict[dt.date, np.ndarray]:
+    """Row positions per date for a parsed entries revision, for constant-time same-day lookups"""
+    return _df_entries.groupby("Date").indices
+
+def daily_totals_rows(daily: pd.DataFrame) -> List[list]:
+    """Daily Totals tab contents: header plus one row per date"""
+    return [DAILY_TOTAL_COLUMNS] + [
+        [d, bool(hol), round(t,2), round(p,2), round(x,2), round(tee,2), round(tot,2)]
+        for d, hol, t, p, x, tee, tot in zip(
+            _date_labels(daily["Date"], "%Y-%m-%d").tolist(),
+            *(daily[c].tolist() for c in DAILY_TOTAL_COLUMNS[1:]),
+        )
+    ]
+
+MONTH_COLUMNS = ENTRY_COLUMNS + ["Entry Total Points"]
+
+def _entry_points_kernel(smin: np.ndarray, emin: np.ndarray, code: np.ndarray, wknd_hol: np.ndarray) -> np.ndarray:
+    """Array-only core: each distinct (code, day type, start, end) summed minute by minute once, rounded to cents"""
+    out = np.zeros(len(smin))
+    valid = (code >= 0) & (smin >= 0) & (emin > smin)
+    if not valid.any():
+        return out
+    shapes, inverse = np.unique(np.column_stack([code, wknd_hol, smin, emin])[valid], axis=0, return_inverse=True)
+    minute = np.arange(1440)
+    inside = (minute >= shapes[:, 2, None]) & (minute < shapes[:, 3, None])
+    pts_min = _MINUTE_RATE_TABLE[shapes[:, 0], shapes[:, 1]] / 60.0
+    # Left-to-right running sum adds in the same order as a per-minute loop, so cents don't drift
+    sums = np.cumsum(np.where(inside, pts_min, 0.0), axis=1)[:, -1]
+    out[valid] = np.array([round(x, 2) for x in sums.tolist()])[inverse.reshape(-1)]
+    return out
+
+def compute_entry_time_points(df: pd.DataFrame) -> np.ndarray:
+    """Per-entry time points (no dominance) for every row at once, summed minute by minute"""
+    if df.empty:
+        return np.zeros(0)
+    return _entry_points_kernel(
+        _time_col_minutes(df["Start"]),
+        _time_col_minutes(df["End"]),
+        df["Category"].map(CATEGORY_CODE).fillna(-1).to_numpy(dtype=np.int64),
+        df["Holiday"].to_numpy(dtype=bool) | _weekend_mask(df["Date"]),
     )
-    dfe["Prod"] = pd.to_numeric(dfe["Productivity Points"], errors="coerce").fillna(0.0)
-    dfe["Extra"] = pd.to_numeric(dfe["Extra Points"], errors="coerce").fillna(0.0)
-    dfe["Entry Total Points"] = dfe["Entry Base Time Points"] + dfe["Prod"] + dfe["Extra"]
-    dfe["MonthName"] = dfe["Date"].apply(month_tab_name)
-
-    for mname, chunk in dfe.groupby("MonthName"):
-        ws = ensure_month_sheet(sh, mname)
-        ws.clear()
-        ws.update("A1:J1", [[
-            "Date","Holiday","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes","Entry Total Points"
-        ]])
-        rows = []
-        for _, r in chunk.sort_values("Date").iterrows():
-            rows.append([
-                r["Date"].strftime("%Y-%m-%d"),
-                bool(r["Holiday"]),
-                r["Category"],
-                fmt_hhmm(r["Start"]), fmt_hhmm(r["End"]),
-                int(r["TEE Exams"] or 0),
-                round(float(r["Productivity Points"] or 0),2),
-                round(float(r["Extra Points"] or 0),2),
-                r.get("Notes",""),
-                round(float(r["Entry Total Points"]),2)
-            ])
-        start_row = 2
-        if rows:
-            ws.update(f"A{start_row}:J{start_row+len(rows)-1}", rows)
-        total_points = round(float(chunk["Entry Total Points"].sum()),2)
-        total_row = start_row + len(rows)
-        ws.update(f"A{total_row}:J{total_row}", [["","MONTH TOTAL","","","","","","","", total_points]])
-        fmt = CellFormat(backgroundColor=Color(red=1.0, green=1.0, blue=0.8), textFormat=TextFormat(bold=True))
-        format_cell_range(ws, f"A{total_row}:J{total_row}", fmt)
-
-def write_monthly_summary(sh, df_entries: pd.DataFrame):
-    ws = sh.worksheet("Monthly Summary")
-    ws.clear()
-    ws.update("A1:B1", [["Month","Total Points"]])
+
+def month_sheet_rows(df_entries: pd.DataFrame, only_months: Optional[set] = None) -> Dict[str, List[list]]:
+    """Contents per month tab (header, entries, MONTH TOTAL); only_months ("Mon YYYY") limits it to the tabs an add touched"""
+    if only_months is not None:
+        df_entries = df_entries[month_labels(df_entries["Date"]).isin(only_months)]
     if df_entries.empty:
-        return
-    per_day = []
-    for d, chunk in df_entries.groupby("Date"):
-        tpts, _, _, _ = compute_day_time_points(d, chunk)
-        tee = float(chunk["TEE Exams"].sum()) * 22.0
-        prod = float(chunk["Productivity Points"].sum())
-        extra = float(chunk["Extra Points"].sum())
-        per_day.append({"Date": d, "Total": tpts + tee + prod + extra})
-    dfd = pd.DataFrame(per_day)
-    if dfd.empty:
-        return
-    dfd["MonthStart"] = dfd["Date"].apply(lambda d: dt.date(d.year, d.month, 1))
-    per_month = dfd.groupby("MonthStart", as_index=False)["Total"].sum().sort_values("MonthStart")
-    rows = []
-    for _, r in per_month.iterrows():
-        rows.append([r["MonthStart"].strftime("%b %Y"), round(float(r["Total"]),2)])
-    if rows:
-        ws.update(f"A2:B{len(rows)+1}", rows)
+        return {}
+    base_pts = compute_entry_time_points(df_entries)
+    dfe = df_entries.assign(**{
+        "Entry Total Points": base_pts + df_entries["Productivity Points"] + df_entries["Extra Points"],
+    })
+    # Vectorized tab names; undated rows come out NaN and are dropped by groupby
+    month_names = month_labels(df_entries["Date"])
+
+    tabs = {}
+    for mname, chunk in dfe.groupby(month_names):
+        # Total over the rows in sheet order, before sorting by date for display
+        total_points = round(float(chunk["Entry Total Points"].sum()),2)
+        chunk = chunk.sort_values("Date")
+        # Python round() on plain floats, as in daily_totals_rows (Series.round differs on half-way values)
+        rows = [
+            row[:6] + [round(prod, 2), round(extra, 2), row[8], round(total, 2)]
+            for row, prod, extra, total in zip(
+                _entry_rows(chunk),
+                chunk["Productivity Points"].tolist(),
+                chunk["Extra Points"].tolist(),
+                chunk["Entry Total Points"].tolist(),
+            )
+        ]
+        tabs[mname] = [MONTH_COLUMNS] + rows + [["","MONTH TOTAL","","","","","","","", total_points]]
+    return tabs
+
+def compute_monthly_totals(daily: pd.DataFrame) -> pd.DataFrame:
+    """Chronological per-month totals ("Mon YYYY", Total) from compute_daily_totals output"""
+    if daily.empty:
+        return pd.DataFrame(columns=["Month","Total"])
+    # Group on monthly periods so months sort chronologically, format only for display
+    months = pd.to_datetime(daily["Date"]).dt.to_period("M")
+    per_month = daily["Total Points"].groupby(months).sum().sort_index()
+    return pd.DataFrame({"Month": per_month.index.strftime("%b %Y"), "Total": per_month.to_numpy()})
+
+def monthly_summary_rows(daily: pd.DataFrame) -> List[list]:
+    """Monthly Summary tab contents: header, one row per month and the Grand Total (omitted when empty)"""
+    header = [["Month","Total Points"]]
+    if daily.empty:
+        return header
+    per_month = compute_monthly_totals(daily)
+    rows = [[m, round(t,2)] for m, t in zip(per_month["Month"].tolist(), per_month["Total"].tolist())]
     grand_total = round(float(per_month["Total"].sum()),2) if not per_month.empty else 0.0
-    total_row = len(rows)+2
-    ws.update(f"A{total_row}:B{total_row}", [["Grand Total", grand_total]])
-    fmt = CellFormat(backgroundColor=Color(red=1.0, green=1.0, blue=0.8), textFormat=TextFormat(bold=True))
-    format_cell_range(ws, f"A{total_row}:B{total_row}", fmt)
+    return header + rows + [["Grand Total", grand_total]]
+
+TOTAL_ROW_FORMAT = CellFormat(backgroundColor=Color(red=1.0, green=1.0, blue=0.8), textFormat=TextFormat(bold=True))
+
+def write_summary_tabs(sh, tabs: Dict[str, List[list]], total_rows: set):
+    """Replace each tab's contents with its block from A1 in three requests overall:
+    one batch clear, one batch value write, one formatting batch for the total rows in total_rows"""
+    if not tabs:
+        return
+    # One metadata fetch finds existing tabs; month tabs that don't exist yet are created
+    existing = {ws.title: ws for ws in sh.worksheets()}
+    for name in tabs:
+        if name not in existing:
+            existing[name] = sh.add_worksheet(title=name, rows=1000, cols=12)
+
+    ranges = [f"'{name}'" for name in tabs]
+    sh.values_batch_clear(body={"ranges": ranges})
+    sh.values_batch_update({
+        "valueInputOption": "RAW",
+        "data": [
+            {"range": f"'{name}'!A1:{col_letter(max(map(len, rows)))}{len(rows)}", "values": rows}
+            for name, rows in tabs.items()
+        ],
+    })
+
+    # Highlight the totals row of every tab that has one, all in one batchUpdate
+    batch = batch_updater(sh)
+    for name, rows in tabs.items():
+        if name in total_rows and len(rows) > 1:
+            batch.format_cell_range(existing[name], f"A{len(rows)}:{col_letter(len(rows[-1]))}{len(rows)}", TOTAL_ROW_FORMAT)
+    if batch.requests:
+        batch.execute()
 
 # ---------------- App ----------------
 st.title("MWA Points Tracker")
@@ -525,19 +649,41 @@ if not creds:
     login_button()
     st.stop()
 
+if st.sidebar.button("Sign out"):
+    # Drop this user's cached client and sheet handles under every token this session used (refreshes rotate it)
+    for token in st.session_state.get("sheet_tokens", {creds.token}):
+        get_user_sheets.clear(token, creds, st.session_state.get("sheet_id"))
+    # Parsed entries and totals are keyed by spreadsheet and revision only; clear them so none outlive the sign-out
+    for cached in (_cached_entries, _cached_daily_totals, _cached_date_index):
+        cached.clear()
+    for key in ("creds", "sheet_id", "sheet_data", "last_refresh", "entries_rev", "sheet_tokens"):
+        st.session_state.pop(key, None)
+    st.rerun()
+
 try:
-    gc = gspread.authorize(st.session_state["creds"])
-    sh, ws_entries, ws_daily, ws_msum = ensure_user_sheet(gc)
+    # A refreshed token misses the cache; the remembered id lets it reopen without a Drive search
+    sh, ws_entries, ws_daily, ws_msum = get_user_sheets(creds.token, creds, st.session_state.get("sheet_id"))
+    st.session_state.setdefault("sheet_tokens", set()).add(creds.token)
+    st.session_state["sheet_id"] = sh.id
 except Exception as e:
     st.error(f"Google Sheets/Drive error: {e}")
     st.stop()
 
 entries = load_entries(ws_entries)
+if entries.empty:
+    daily_totals = compute_daily_totals(entries)
+    rows_by_date = {}
+else:
+    daily_totals = _cached_daily_totals(ws_entries.spreadsheet_id, st.session_state["entries_rev"], entries)
+    rows_by_date = _cached_date_index(ws_entries.spreadsheet_id, st.session_state["entries_rev"], entries)
 
 tab_entries, tab_summary = st.tabs(["Entries","Summary"])
 
 with tab_entries:
     st.subheader("Add Time Intervals")
+    if "add_success" in st.session_state:
+        st.success(st.session_state.pop("add_success"))
+        st.balloons()
 
     cc_head = st.columns([1,1.2,1.2,1])
     tee = cc_head[0].number_input("TEE Exams (22 pts each)", min_value=0, step=1, value=0, key="tee_add")
@@ -652,7 +798,7 @@ with tab_entries:
                     "Notes": notes_value
                 })
 
-        preview_df = pd.DataFrame(preview_rows)
+        preview_df = _coerce_entry_dtypes(pd.DataFrame(preview_rows, columns=ENTRY_COLUMNS))
         if not preview_df.empty:
             preview_df = preview_df.sort_values(["Date","Start"]).reset_index(drop=True)
 
@@ -684,9 +830,7 @@ with tab_entries:
                 preview_df["Holiday"] = preview_df["Date"].map(lambda d: holiday_map.get(d, False))
 
             if not preview_df.empty:
-                show = preview_df.copy()
-                show["Start"] = show["Start"].apply(fmt_hhmm)
-                show["End"] = show["End"].apply(fmt_hhmm)
+                show = preview_df.assign(Start=fmt_hhmm_col(preview_df["Start"]), End=fmt_hhmm_col(preview_df["End"]))
                 st.dataframe(show, use_container_width=True, hide_index=True)
 
                 per_date_info = []
@@ -701,33 +845,23 @@ with tab_entries:
                     st.markdown(f"**New time points (dominance) for {d.strftime('%m/%d/%Y')}: {tpts:.2f}**")
                     st.caption(f"Per-band (time-based only): 1.00x={band_pts['1.00x']:.2f} | 1.10x={band_pts['1.10x']:.2f} | 1.25x={band_pts['1.25x']:.2f}")
 
-                if float(prod or 0.0) != 0.0 or float(extra or 0.0) != 0.0 or int(tee or 0) > 0:
+                if prod != 0.0 or extra != 0.0 or tee > 0:
                     target_date = sorted_dates[min(adders_day_index, len(sorted_dates)-1)]
-                    adders_total = float(prod or 0.0) + float(extra or 0.0) + float(int(tee or 0)*22.0)
+                    adders_total = prod + extra + tee * 22.0
                     st.markdown(f"**One-time adders will be applied to {target_date.strftime('%m/%d/%Y')}: {adders_total:.2f} pts**")
 
-                if not entries.empty:
-                    existing_by_date = {}
-                    for d in sorted_dates:
-                        same_day = entries[pd.to_datetime(entries["Date"]).dt.date == d]
-                        if not same_day.empty:
-                            cur_tpts, _, _, _ = compute_day_time_points(d, same_day)
-                            cur_tee = float(same_day.get("TEE Exams", 0).sum()) * 22.0
-                            cur_prod = float(same_day.get("Productivity Points", 0).sum())
-                            cur_extra = float(same_day.get("Extra Points", 0).sum())
-                            existing_by_date[d] = cur_tpts + cur_tee + cur_prod + cur_extra
-                        else:
-                            existing_by_date[d] = 0.0
-                else:
-                    existing_by_date = {d:0.0 for d in sorted_dates}
+                saved_totals = dict(zip(daily_totals["Date"], daily_totals["Total Points"]))
+                existing_by_date = {d: saved_totals.get(d, 0.0) for d in sorted_dates}
 
-                st.markdown("#### Projected totals by date (including currently saved entries)")
+                projected_lines = []
                 for idx, (d, tpts, _, _) in enumerate(per_date_info):
                     add_one_time = 0.0
                     if idx == adders_day_index:
-                        add_one_time = float(prod or 0.0) + float(extra or 0.0) + float(int(tee or 0)*22.0)
+                        add_one_time = prod + extra + tee * 22.0
                     projected = existing_by_date.get(d,0.0) + tpts + add_one_time
-                    st.markdown(f"- **{d.strftime('%m/%d/%Y')}** -> {projected:.2f} points")
+                    projected_lines.append(f"- **{d.strftime('%m/%d/%Y')}** -> {projected:.2f} points")
+                # Heading and every date in one element rather than one per line
+                st.markdown("#### Projected totals by date (including currently saved entries)\n" + "\n".join(projected_lines))
 
             if st.button("✅ Add to Sheet", type="primary"):
                 if not preview_df.empty:
@@ -739,56 +873,102 @@ with tab_entries:
                         idxs = preview_df.index[preview_df["Date"] == chosen_date].tolist()
                         if idxs:
                             target_idx = idxs[0]
-                            preview_df.loc[target_idx, "TEE Exams"] = int(tee or 0)
-                            preview_df.loc[target_idx, "Productivity Points"] = float(prod or 0.0)
-                            preview_df.loc[target_idx, "Extra Points"] = float(extra or 0.0)
-
-                    entries_out = pd.concat([entries, preview_df], ignore_index=True)
-                    save_entries(ws_entries, entries_out)
-                    write_daily_totals(sh, entries_out)
-                    write_month_sheets(sh, entries_out)
-                    write_monthly_summary(sh, entries_out)
+                            preview_df.loc[target_idx, "TEE Exams"] = tee
+                            preview_df.loc[target_idx, "Productivity Points"] = prod
+                            preview_df.loc[target_idx, "Extra Points"] = extra
+
+                    # Same form instance submitting the same rows again (double click / rerun race) writes nothing
+                    submit_hash = hash(repr((st.session_state.interval_ids_v5, _entry_rows(preview_df))))
+                    # Rows already appended by an attempt whose summary writes failed are not appended again
+                    summaries_pending = st.session_state.get("add_summaries_pending") == submit_hash
+                    if st.session_state.get("last_add_hash") == submit_hash and not summaries_pending:
+                        st.info("These intervals were already added.")
+                    else:
+                        with st.spinner("Saving to Google Sheets..."):
+                            # Summaries are rebuilt from all entries, and the append needs to know whether
+                            # the tab is empty, so fetch once if never loaded
+                            if st.session_state.get("sheet_data") is None:
+                                set_sheet_data(fetch_entry_values(ws_entries))
+                            if not summaries_pending:
+                                # An empty tab (get_values gives [] or [[]]) gets its header in the same append,
+                                # or the first entry would be read back as the header
+                                sheet_data = st.session_state["sheet_data"]
+                                tab_empty = len(sheet_data) <= 1 and not any(map(any, sheet_data))
+                                try:
+                                    # Claim the submission right before writing: a second click interrupts this
+                                    # run at the next element update, after append_rows may already have gone out
+                                    st.session_state["last_add_hash"] = submit_hash
+                                    new_rows = append_entries(ws_entries, preview_df, with_header=tab_empty)
+                                except Exception:
+                                    # Nothing was appended, so allow the same submission to be retried
+                                    st.session_state.pop("last_add_hash", None)
+                                    raise
+                                # The rows are in; from here a retry only redoes the summary tabs
+                                st.session_state["add_summaries_pending"] = submit_hash
+                                # Keep the session copy in step with the sheet so later adds see these rows.
+                                # Grow the stored rows in place (amortized append) instead of copying the whole history
+                                if tab_empty:
+                                    sheet_data.clear()
+                                sheet_data.extend(new_rows)
+                                set_sheet_data(sheet_data)
+                            # Parsing here warms the cache for the rerun below
+                            entries_out = _cached_entries(ws_entries.spreadsheet_id, st.session_state["entries_rev"], st.session_state["sheet_data"])
+                            # One daily-totals pass feeds both summary tabs and the rerun's Summary view
+                            daily_out = _cached_daily_totals(ws_entries.spreadsheet_id, st.session_state["entries_rev"], entries_out)
+                            # Only months that received rows change; other month tabs are left as they are
+                            added_months = set(month_labels(preview_df["Date"]))
+                            # Daily Totals, Monthly Summary and the touched month tabs go up together
+                            month_tabs = month_sheet_rows(entries_out, only_months=added_months)
+                            write_summary_tabs(
+                                sh,
+                                {
+                                    ws_daily.title: daily_totals_rows(daily_out),
+                                    ws_msum.title: monthly_summary_rows(daily_out),
+                                    **month_tabs,
+                                },
+                                total_rows={ws_msum.title, *month_tabs},
+                            )
+                            st.session_state.pop("add_summaries_pending", None)
                     
-                    # Reset form
-                    st.session_state.intervals_v5 = [{
-                        "category": CATEGORIES[0],
-                        "start_date": dt.date.today(),
-                        "start_time": "",
-                        "end_date": dt.date.today(),
-                        "end_time": "",
-                    }]
-                    st.session_state.interval_ids_v5 = [f"int_{int(time.time()*1000)}"]
-                    st.session_state.show_preview = False
+                        # Reset form
+                        st.session_state.intervals_v5 = [{
+                            "category": CATEGORIES[0],
+                            "start_date": dt.date.today(),
+                            "start_time": "",
+                            "end_date": dt.date.today(),
+                            "end_time": "",
+                        }]
+                        st.session_state.interval_ids_v5 = [f"int_{int(time.time()*1000)}"]
+                        st.session_state.show_preview = False
                     
-                    # Clear the input fields
-                    for key in list(st.session_state.keys()):
-                        if key.startswith(('stime_', 'etime_', 'cat_', 'sdate_', 'edate_')):
-                            del st.session_state[key]
+                        # Clear the input fields
+                        for key in list(st.session_state.keys()):
+                            if key.startswith(('stime_', 'etime_', 'cat_', 'sdate_', 'edate_')):
+                                del st.session_state[key]
                     
-                    st.success(f"✅ Successfully added {len(preview_df)} interval(s) to the sheet and updated all summaries!")
-                    st.balloons()
-                    time.sleep(1.5)
-                    st.rerun()
+                        # Shown by the rerun below instead of holding this run open for the message
+                        st.session_state["add_success"] = f"✅ Successfully added {len(preview_df)} interval(s) to the sheet and updated all summaries!"
+                        st.rerun()
                 else:
                     st.warning("Enter at least one valid interval before adding.")
     else:
         st.info("👆 Click 'Generate Preview' to see the point calculations before adding to sheet.")
             
-with tab_summary:
+@st.fragment
+def render_summary_tab(entries: pd.DataFrame, daily_totals: pd.DataFrame, rows_by_date: Dict[dt.date, np.ndarray]):
+    """Summary tab body; picking a date reruns only this fragment, not the Entries form and preview"""
     st.subheader("Daily & Monthly Summary")
 
     col = st.columns([1,1.2,1.2])
     dsel = col[0].date_input("Pick a date", value=dt.date.today(), format="MM/DD/YYYY", key="summary_date")
-    if not entries.empty:
-        day_df = entries[pd.to_datetime(entries["Date"]).dt.date == dsel]
-    else:
-        day_df = pd.DataFrame(columns=entries.columns if not entries.empty else ["Date","Category","Start","End","TEE Exams","Productivity Points","Extra Points","Notes","Holiday"])
+    day_df = entries.iloc[rows_by_date.get(dsel, [])]
 
     if not day_df.empty:
         tpts, per_cat_min, assigned_min, band_pts = compute_day_time_points(dsel, day_df)
-        tee_pts = float(day_df.get("TEE Exams", 0).sum()) * 22.0
-        prod_pts = float(day_df.get("Productivity Points", 0).sum())
-        extra_pts = float(day_df.get("Extra Points", 0).sum())
+        sums = day_df[["TEE Exams","Productivity Points","Extra Points"]].sum()
+        tee_pts = sums["TEE Exams"] * 22.0
+        prod_pts = sums["Productivity Points"]
+        extra_pts = sums["Extra Points"]
         total = tpts + tee_pts + prod_pts + extra_pts
         st.markdown(f"**Time Points (dominance): {tpts:.2f}**")
         st.caption(f"Per-band (time-based only): 1.00x={band_pts['1.00x']:.2f} | 1.10x={band_pts['1.10x']:.2f} | 1.25x={band_pts['1.25x']:.2f}")
@@ -797,18 +977,12 @@ with tab_summary:
     else:
         st.info("No entries for the selected date yet.")
 
-    if not entries.empty:
-        per_day = []
-        for d, chunk in entries.groupby("Date"):
-            tpts, _, _, _ = compute_day_time_points(d, chunk)
-            tee = float(chunk["TEE Exams"].sum()) * 22.0
-            prod = float(chunk["Productivity Points"].sum())
-            extra = float(chunk["Extra Points"].sum())
-            per_day.append({"Date": d, "Total": tpts + tee + prod + extra})
-        dfd = pd.DataFrame(per_day)
-        dfd["Month"] = dfd["Date"].apply(lambda d: d.strftime("%b %Y"))
-        per_month = dfd.groupby("Month", as_index=False)["Total"].sum().sort_values("Month")
+    if not daily_totals.empty:
+        per_month = compute_monthly_totals(daily_totals)
         st.subheader("Monthly Summary")
         st.dataframe(per_month, use_container_width=True, hide_index=True)
     else:
         st.info("No monthly data to summarize yet.")
+
+with tab_summary:
+    render_summary_tab(entries, daily_totals, rows_by_date)